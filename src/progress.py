@@ -0,0 +1,587 @@
+from __future__ import annotations
+
+import os
+import sys
+import csv
+import gzip
+import json
+import hashlib
+import argparse
+import threading
+import datetime as dt
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Set
+from urllib.parse import urlencode
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# pandas/numpy are imported where the table is built, so config/env errors
+# fail before paying for the import
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ---- env ----
+KOBO_BASE_URL = os.getenv("KOBO_BASE_URL", "").rstrip("/")
+KOBO_TOKEN = os.getenv("KOBO_TOKEN", "")
+
+# ---- fetch ----
+PAGE_WORKERS = 8  # parallel page requests once the total count is known
+
+# ---- Kobo actual column names (confirmed, same in both forms) ----
+FIELD_CAMP_CODE = "section0/sec0_camp"
+FIELD_FARMER_ID = "section0/sec0_farmerid"
+
+# ---- camp code -> label (district ignored) ----
+LUAPULA_CAMPS = {
+    "1": "Mabumba",
+    "2": "Monga",
+    "3": "Lukwesa",
+    "4": "Chibondo",
+    "5": "Katuta",
+    "6": "Kabalange",
+    "7": "Lusambo",
+    "8": "Luena",
+    "9": "Kanengo",
+}
+
+WESTERN_CAMPS = {
+    "1": "Lukena",
+    "2": "Mishulundu",
+    "3": "Namatindi",
+    "4": "Ng'Uma",
+    "5": "Sihole",
+    "6": "Ikabako",
+    "7": "Limulunga North",
+    "8": "Limulunga South",
+    "9": "Nangili",
+    "10": "Ndanda East",
+    "11": "Ndanda West",
+    "12": "Simaa",
+    "13": "Sitoya",
+    "14": "Ushaa",
+    "15": "Kawaya",
+    "16": "Kashamba",
+    "17": "Luanchuma",
+    "18": "Lyalala",
+    "19": "Mbanga",
+    "20": "Ngulwana",
+    "21": "Kakwacha",
+    "22": "Lubelele",
+    "23": "Lutembwe",
+    "24": "Muyondoti",
+    "25": "Mataba",
+    "26": "Mitete Central",
+    "27": "Sitwala",
+    "28": "Sikunduko",
+    "29": "Lupuyi",
+    "30": "Kama",
+    "31": "Litawa",
+    "32": "Nakanya",
+    "33": "Nalwei",
+    "34": "Namushakende",
+    "35": "Namusheshe",
+    "36": "Sefula",
+    "37": "Tapo",
+    "38": "Liliachi",
+    "39": "Litoya",
+    "40": "Muoyo",
+    "41": "Nasilimwe",
+}
+
+# ---- paths ----
+OUT_DIR = Path(os.getenv("OUT_DIR", "docs"))
+# raw Kobo pages + ETags (kept out of docs/ so submissions are not published)
+CACHE_DIR = os.getenv("KOBO_CACHE_DIR", ".cache/kobo")
+# rebuild anyway once the last build is this old (in-place edits don't show
+# up in the change probe)
+STATE_MAX_AGE = dt.timedelta(days=3)
+
+
+@dataclass(frozen=True)
+class ProgressConfig:
+    name: str                      # shown in the page title
+    asset_uid_env: str             # env var holding the Kobo asset uid
+    camp_label_map: Dict[str, str]
+    target_csv: str
+    out_html: str                  # file names inside OUT_DIR
+    out_csv: str
+
+
+CONFIGS: Dict[str, ProgressConfig] = {
+    "luapula": ProgressConfig(
+        name="Luapula",
+        asset_uid_env="LUAPULA_ASSET_UID",
+        camp_label_map=LUAPULA_CAMPS,
+        target_csv="data/luapula_camps.csv",
+        out_html="luapula.html",
+        out_csv="luapula_progress.csv",
+    ),
+    "western": ProgressConfig(
+        name="Western",
+        asset_uid_env="WESTERN_ASSET_UID",
+        camp_label_map=WESTERN_CAMPS,
+        target_csv="data/western_camps.csv",
+        out_html="western.html",
+        out_csv="western_progress.csv",
+    ),
+}
+
+
+def normalize_str(x: Any) -> Optional[str]:
+    if x is None:
+        return None
+    s = str(x).strip()
+    return s if s else None
+
+
+def headers() -> Dict[str, str]:
+    if not KOBO_TOKEN:
+        raise RuntimeError("KOBO_TOKEN is empty. Set GitHub Secret KOBO_TOKEN.")
+    return {"Authorization": f"Token {KOBO_TOKEN}", "Accept": "application/json"}
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def session() -> requests.Session:
+    # one keep-alive session for every page request of every region (built on
+    # first use so the token check still happens lazily; regions run in threads)
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            s = requests.Session()
+            s.headers.update(headers())
+            retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+            pool = HTTPAdapter(pool_maxsize=PAGE_WORKERS * len(CONFIGS), max_retries=retry)
+            s.mount("https://", pool)
+            _SESSION = s
+    return _SESSION
+
+
+def cache_path(url: str, params: Optional[Dict[str, Any]]) -> str:
+    key = url + "?" + urlencode(sorted((params or {}).items()))
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+
+def get_page(url: str, params: Optional[Dict[str, Any]]) -> Any:
+    # conditional GET: if the page is unchanged since the last run Kobo answers
+    # 304 with no body and the cached copy is used
+    path = cache_path(url, params)
+    req_headers = {}
+    if os.path.exists(path + ".etag") and os.path.exists(path + ".json.gz"):
+        with open(path + ".etag", encoding="utf-8") as f:
+            req_headers["If-None-Match"] = f.read().strip()
+
+    r = session().get(url, params=params, headers=req_headers, timeout=60)
+    if r.status_code == 304 and req_headers:
+        with gzip.open(path + ".json.gz", "rb") as f:
+            return orjson.loads(f.read())
+    if r.status_code != 200:
+        raise RuntimeError(f"Kobo API error {r.status_code}: {r.text[:300]}")
+
+    etag = r.headers.get("ETag")
+    if etag:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with gzip.open(path + ".json.gz", "wb") as f:
+            f.write(r.content)
+        with open(path + ".etag", "w", encoding="utf-8") as f:
+            f.write(etag)
+    return orjson.loads(r.content)
+
+
+def page_results(payload: Any) -> List[Dict[str, Any]]:
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        return payload["results"]
+    raise RuntimeError("Unexpected Kobo response format.")
+
+
+def data_url(asset_uid: str, asset_uid_env: str) -> str:
+    if not KOBO_BASE_URL:
+        raise RuntimeError("KOBO_BASE_URL is empty.")
+    if not asset_uid:
+        raise RuntimeError(f"{asset_uid_env} is empty.")
+    return f"{KOBO_BASE_URL}/api/v2/assets/{asset_uid}/data/"
+
+
+def fetch_marker(url: str) -> Optional[str]:
+    # cheap probe: total count + _id of the newest submission, so a delete
+    # followed by a new submission is noticed too
+    params = {
+        "format": "json",
+        "fields": json.dumps(["_id"]),
+        "sort": json.dumps({"_id": -1}),
+        "limit": 1,
+    }
+    payload = get_page(url, params)
+    if not isinstance(payload, dict) or not isinstance(payload.get("count"), int):
+        return None
+    results = payload.get("results") or []
+    newest = results[0].get("_id") if results and isinstance(results[0], dict) else None
+    return f"{payload['count']} {newest}"
+
+
+def fetch_all_submissions(url: str) -> List[Dict[str, Any]]:
+    # only the two columns we aggregate; sorted by _id so start offsets are stable
+    params = {
+        "format": "json",
+        "fields": json.dumps([FIELD_CAMP_CODE, FIELD_FARMER_ID]),
+        "sort": json.dumps({"_id": 1}),
+    }
+
+    payload = get_page(url, params)
+    if isinstance(payload, list):
+        return payload
+
+    out = list(page_results(payload))
+    if not payload.get("next"):
+        return out
+
+    # total count + page size are known after the first page, so the remaining
+    # pages can be requested by start offset in parallel instead of chasing "next"
+    count = payload.get("count")
+    limit = len(out)
+    if not isinstance(count, int) or not limit:
+        nxt = payload.get("next")
+        while nxt:
+            payload = get_page(nxt, None)
+            out.extend(page_results(payload))
+            nxt = payload.get("next")
+        return out
+
+    offsets = range(limit, count, limit)
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as ex:
+        pages = ex.map(lambda start: get_page(url, {**params, "start": start, "limit": limit}), offsets)
+        for page in pages:
+            out.extend(page_results(page))
+
+    return out
+
+
+def load_targets(path: str) -> pd.DataFrame:
+    """
+    Target table per camp. Required columns:
+      - camp_label (or sec0_camp_label / camp / Camp / label)
+      - target_n (or target / Target / n_target / N_target)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Target CSV not found: {path}")
+
+    import pandas as pd
+
+    df = pd.read_csv(path, dtype=str)
+
+    if "camp_label" not in df.columns:
+        for alt in ["sec0_camp_label", "camp", "Camp", "label"]:
+            if alt in df.columns:
+                df = df.rename(columns={alt: "camp_label"})
+                break
+
+    if "target_n" not in df.columns:
+        for alt in ["target", "Target", "n_target", "N_target"]:
+            if alt in df.columns:
+                df = df.rename(columns={alt: "target_n"})
+                break
+
+    if "camp_label" not in df.columns or "target_n" not in df.columns:
+        raise ValueError(f"{path} must have columns camp_label,target_n (or compatible names)")
+
+    df["camp_label"] = df["camp_label"].map(normalize_str)
+    df = df.dropna(subset=["camp_label"])
+    df["target_n"] = df["target_n"].astype(int)
+    return df
+
+
+def build_progress(
+    submissions: List[Dict[str, Any]], target_df: pd.DataFrame, camp_label_map: Dict[str, str]
+) -> pd.DataFrame:
+    # unique farmerid per camp code, counted in one pass over the submissions
+    by_code: Dict[str, Set[str]] = defaultdict(set)
+    missing_camp_rows = 0
+    missing_farmerid_rows = 0
+    for s in submissions:
+        code = normalize_str(s.get(FIELD_CAMP_CODE))
+        fid = normalize_str(s.get(FIELD_FARMER_ID))
+        if code is None:
+            missing_camp_rows += 1
+        if fid is None:
+            missing_farmerid_rows += 1
+        if code is not None:
+            ids = by_code[code]
+            if fid is not None:
+                ids.add(fid)
+
+    # camp code -> label once per distinct code, not once per submission
+    collected: Dict[str, Set[str]] = defaultdict(set)
+    for code, ids in by_code.items():
+        label = camp_label_map.get(code)
+        if label:
+            collected[label] |= ids
+
+    # unmapped codes (quality check)
+    unmapped_codes = sorted(c for c in by_code if c not in camp_label_map)
+
+    df = target_df.copy()
+    df["collected_n"] = df["camp_label"].map({k: len(v) for k, v in collected.items()}).fillna(0).astype(int)
+
+    df["remaining_n"] = (df["target_n"] - df["collected_n"]).clip(lower=0).astype(int)
+    df["progress_pct"] = (100 * df["collected_n"] / df["target_n"]).fillna(0.0)
+
+    # attach diagnostics (same value for all rows; just for display)
+    df["missing_camp_rows"] = missing_camp_rows
+    df["missing_farmerid_rows"] = missing_farmerid_rows
+    df["unmapped_camp_codes"] = ", ".join(unmapped_codes)
+
+    df = df.sort_values(["progress_pct", "remaining_n"], ascending=[True, False]).reset_index(drop=True)
+    return df
+
+
+ROW_TMPL = """
+        <tr class="{status}">
+          <td class="camp">{camp}</td>
+          <td class="num">{target_n}</td>
+          <td class="num">{collected_n}</td>
+          <td class="num">{remaining_n}</td>
+          <td class="progress">
+            <div class="bar-bg"><div class="bar" style="width:{bar:.1f}%"></div></div>
+            <div class="pct">{pct:.1f}%</div>
+          </td>
+        </tr>
+        """
+
+
+PAGE_TMPL = """<!doctype html>
+<html lang="ja">
+<head>
+<meta charset="utf-8" />
+<meta name="viewport" content="width=device-width,initial-scale=1" />
+<title>{title}</title>
+<style>
+  :root {{
+    --fg:#111; --muted:#666; --bg:#fff; --line:#e6e6e6;
+    --bar:#111; --barbg:#f2f2f2;
+    --behind:#fff7ed; --done:#f6ffed;
+    --shadow: 0 8px 24px rgba(0,0,0,.06);
+    font-family: system-ui, -apple-system, "Segoe UI", Roboto, "Noto Sans JP", sans-serif;
+  }}
+  body {{ margin:0; color:var(--fg); background:#fafafa; }}
+  .wrap {{ max-width: 1100px; margin: 32px auto; padding: 0 16px; }}
+  header {{ display:flex; justify-content:space-between; align-items:flex-end; gap:16px; margin-bottom: 12px; }}
+  h1 {{ font-size: 20px; margin:0; }}
+  .meta {{ color: var(--muted); font-size: 13px; white-space: nowrap; }}
+  .card {{ background: var(--bg); border: 1px solid var(--line); border-radius: 16px; box-shadow: var(--shadow); overflow:hidden; }}
+  table {{ width:100%; border-collapse: collapse; }}
+  thead th {{ text-align:left; font-size: 13px; color: var(--muted); padding: 12px 14px; border-bottom:1px solid var(--line); background:#fcfcfc; position:sticky; top:0; }}
+  tbody td {{ padding: 12px 14px; border-bottom: 1px solid var(--line); font-size: 14px; }}
+  tbody tr.behind {{ background: var(--behind); }}
+  tbody tr.done {{ background: var(--done); }}
+  td.num {{ text-align:right; font-variant-numeric: tabular-nums; width: 90px; }}
+  td.camp {{ font-weight: 600; }}
+  td.progress {{ width: 240px; }}
+  .bar-bg {{ height: 10px; background: var(--barbg); border-radius: 999px; overflow:hidden; border:1px solid #eaeaea; }}
+  .bar {{ height:100%; background: var(--bar); }}
+  .pct {{ font-size: 12px; color: var(--muted); margin-top: 6px; text-align:right; font-variant-numeric: tabular-nums; }}
+  .footer {{ display:flex; justify-content:space-between; align-items:flex-start; gap:12px; padding: 12px 14px; color: var(--muted); font-size: 13px; }}
+</style>
+</head>
+<body>
+  <div class="wrap">
+    <header>
+      <h1>{title}</h1>
+      <div class="meta">Last updated: {updated_at}</div>
+    </header>
+
+    <div class="card">
+      <table>
+        <thead>
+          <tr>
+            <th>Camp</th>
+            <th style="text-align:right;">Target</th>
+            <th style="text-align:right;">Collected</th>
+            <th style="text-align:right;">Remaining</th>
+            <th>Progress</th>
+          </tr>
+        </thead>
+        <tbody>
+          {rows}
+        </tbody>
+      </table>
+      <div class="footer">
+        <div>
+          <div>missing camp rows: <b>{miss_camp}</b></div>
+          <div>missing farmerid rows: <b>{miss_fid}</b></div>
+          {unmapped_line}
+        </div>
+        <div><a href="./{csv_name}">CSV</a></div>
+      </div>
+    </div>
+  </div>
+</body>
+</html>
+"""
+
+
+def render_html(df: pd.DataFrame, updated_at: str, cfg: ProgressConfig) -> str:
+    miss_camp = int(df["missing_camp_rows"].iloc[0]) if len(df) else 0
+    miss_fid = int(df["missing_farmerid_rows"].iloc[0]) if len(df) else 0
+    unmapped = df["unmapped_camp_codes"].iloc[0] if len(df) else ""
+
+    import numpy as np
+
+    # clamp + classify as whole columns, then only format per row
+    bars = df["progress_pct"].to_numpy().clip(0.0, 100.0)
+    statuses = np.where(df["remaining_n"].to_numpy() > 0, "behind", "done")
+
+    cols = ["camp_label", "target_n", "collected_n", "remaining_n", "progress_pct"]
+    rows = [
+        ROW_TMPL.format(
+            status=status,
+            camp=camp,
+            target_n=target_n,
+            collected_n=collected_n,
+            remaining_n=remaining_n,
+            bar=bar,
+            pct=pct,
+        )
+        for (camp, target_n, collected_n, remaining_n, pct), bar, status
+        in zip(df[cols].itertuples(index=False, name=None), bars, statuses)
+    ]
+
+    unmapped_line = f"<div>unmapped camp codes: <b>{unmapped}</b></div>" if unmapped else ""
+
+    return PAGE_TMPL.format(
+        title=f"{cfg.name} Survey Progress",
+        csv_name=cfg.out_csv,
+        updated_at=updated_at,
+        rows="".join(rows),
+        miss_camp=miss_camp,
+        miss_fid=miss_fid,
+        unmapped_line=unmapped_line,
+    )
+
+
+def write_csv(df: pd.DataFrame, path: Path) -> None:
+    # small table: plain csv.writer, same layout as df.to_csv(index=False)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(df.columns)
+        w.writerows(df.itertuples(index=False, name=None))
+
+
+def gzip_path(path: Path) -> Path:
+    return path.with_name(path.name + ".gz")
+
+
+def write_gzip_copy(path: Path) -> None:
+    # pre-compressed copy next to the plain file; mtime=0 keeps the bytes stable
+    # so an unchanged output does not show up as a diff
+    gzip_path(path).write_bytes(gzip.compress(path.read_bytes(), compresslevel=6, mtime=0))
+
+
+_LOG_LOCK = threading.Lock()
+
+
+def log(*lines: str) -> None:
+    # regions run in threads; keep each region's lines together
+    with _LOG_LOCK:
+        for line in lines:
+            print(line)
+
+
+def run_state(cfg: ProgressConfig, marker: Optional[str]) -> Optional[str]:
+    # what the outputs were built from: Kobo marker + targets + camp map + this code
+    if marker is None:
+        return None
+    h = hashlib.sha1()
+    with open(cfg.target_csv, "rb") as f:
+        h.update(f.read())
+    h.update(repr(sorted(cfg.camp_label_map.items())).encode("utf-8"))
+    h.update(Path(__file__).read_bytes())
+    return f"{marker} {h.hexdigest()}"
+
+
+def state_is_current(path: Path, state: str) -> bool:
+    # state file: the run_state line, then the UTC time of that build
+    if not path.exists():
+        return False
+    saved, _, built_at = path.read_text(encoding="utf-8").partition("\n")
+    try:
+        age = dt.datetime.now(dt.timezone.utc) - dt.datetime.fromisoformat(built_at.strip())
+    except ValueError:
+        return False
+    return saved == state and age < STATE_MAX_AGE
+
+
+def run(cfg: ProgressConfig, updated_at: str, force: bool = False) -> None:
+    out_html = OUT_DIR / cfg.out_html
+    out_csv = OUT_DIR / cfg.out_csv
+    state_path = Path(CACHE_DIR) / f"{cfg.out_csv}.last_build"
+
+    # config errors fail before any Kobo request (and before importing pandas)
+    if not os.path.exists(cfg.target_csv):
+        raise FileNotFoundError(f"Target CSV not found: {cfg.target_csv}")
+
+    url = data_url(os.getenv(cfg.asset_uid_env, ""), cfg.asset_uid_env)
+    state = run_state(cfg, fetch_marker(url))
+    outputs = [out_html, out_csv, gzip_path(out_html), gzip_path(out_csv)]
+    if (
+        not force
+        and state is not None
+        and state_is_current(state_path, state)
+        and all(p.exists() for p in outputs)
+    ):
+        # same submissions, targets and code as a recent build: keep the pages
+        for path in outputs:
+            path.touch()
+        log(f"Unchanged: {out_html} {out_csv} (use --force to rebuild)")
+        return
+
+    submissions = fetch_all_submissions(url)
+    target_df = load_targets(cfg.target_csv)
+    df = build_progress(submissions, target_df, cfg.camp_label_map)
+
+    write_csv(df, out_csv)
+    out_html.write_text(render_html(df, updated_at, cfg), encoding="utf-8")
+
+    for path in (out_html, out_csv):
+        write_gzip_copy(path)
+
+    if state is not None:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        built_at = dt.datetime.now(dt.timezone.utc).isoformat()
+        state_path.write_text(f"{state}\n{built_at}\n", encoding="utf-8")
+
+    log(f"Wrote: {out_html} (+ .gz)", f"Wrote: {out_csv} (+ .gz)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build survey progress pages from Kobo submissions.")
+    parser.add_argument("regions", nargs="*", help=f"regions to build: {', '.join(CONFIGS)} (default: all)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if Kobo reports no new submissions")
+    args = parser.parse_args()
+    unknown = [r for r in args.regions if r not in CONFIGS]
+    if unknown:
+        parser.error(f"unknown region(s): {', '.join(unknown)}")
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    updated_at = dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    # regions are independent (own asset, own output files) and mostly wait on
+    # Kobo, so build them side by side
+    configs = [CONFIGS[name] for name in dict.fromkeys(args.regions or CONFIGS)]
+    with ThreadPoolExecutor(max_workers=len(configs)) as ex:
+        list(ex.map(lambda cfg: run(cfg, updated_at, args.force), configs))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print("ERROR:", e, file=sys.stderr)
+        sys.exit(1)